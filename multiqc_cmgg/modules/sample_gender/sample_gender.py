@@ -0,0 +1,193 @@
+""" MultiQC submodule to aggregate gender predictions from multiple QC methods """
+
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+from multiqc.modules.base_module import BaseMultiqcModule
+from multiqc.plots import table
+
+# Initialize the logger
+log = logging.getLogger("multiqc")
+
+# One prediction method per supported file type
+METHOD_KEYS = ("gender_xy", "gender_hetx", "gender_sry")
+
+# Normalization of the spelled-out predictions to single-letter calls
+SEX_MAP = {"male": "M", "female": "F"}
+
+# Discriminating column per file type, mapped to the method key it predicts
+PARAM_MAP = {
+    "reads_chry": "gender_xy",
+    "het_fraction": "gender_hetx",
+    "coverage_sry": "gender_sry",
+}
+HDR_RE = re.compile("|".join(PARAM_MAP))
+
+# Table layout, shared across module instantiations
+TABLE_HEADERS = {
+    "calc_gender": {
+        "title": "Consensus",
+        "description": "Consensus gender over all prediction methods",
+        "scale": False,
+        "cond_formatting_rules": {"unknown": [{"s_eq": "Unknown"}]},
+        "cond_formatting_colours": [{"unknown": "#f0ad4e"}],
+    },
+    "certainty": {
+        "title": "Certainty",
+        "description": "Fraction of prediction methods agreeing with the consensus",
+        "min": 0,
+        "max": 1,
+        "format": "{:,.2f}",
+        "scale": "RdYlGn",
+    },
+    "gender_xy": {
+        "title": "XY reads",
+        "description": "Gender predicted from the chrX/chrY read ratio",
+        "scale": False,
+    },
+    "gender_hetx": {
+        "title": "HetX",
+        "description": "Gender predicted from the chrX heterozygosity",
+        "scale": False,
+    },
+    "gender_sry": {
+        "title": "SRY",
+        "description": "Gender predicted from the SRY coverage",
+        "scale": False,
+    },
+    "reads_chrx": {
+        "title": "Reads chrX",
+        "description": "Number of reads mapped to chrX",
+        "format": "{:,.0f}",
+        "hidden": True,
+    },
+    "reads_chry": {
+        "title": "Reads chrY",
+        "description": "Number of reads mapped to chrY",
+        "format": "{:,.0f}",
+        "hidden": True,
+    },
+    "het_fraction": {
+        "title": "Het fraction",
+        "description": "Fraction of heterozygous calls on chrX",
+        "format": "{:,.3f}",
+        "hidden": True,
+    },
+    "coverage_sry": {
+        "title": "SRY coverage",
+        "description": "Mean coverage over the SRY gene",
+        "format": "{:,.1f}",
+        "hidden": True,
+    },
+}
+
+TABLE_CONFIG = {
+    "id": "sample_gender_table",
+    "namespace": "sample_gender",
+    "table_title": "Sample gender: consensus",
+    "save_file": True,
+    "col1_header": "Sample",
+    "no_beeswarm": True,
+}
+
+
+class MultiqcModule(BaseMultiqcModule):
+    def __init__(self):
+
+        super(MultiqcModule, self).__init__(
+            name="Sample gender",
+            anchor="sample_gender",
+            info=" - Consensus gender determination based on chrX/chrY reads, chrX heterozygosity and SRY coverage",
+        )
+
+        records = []
+        for f in self.find_log_files("sample_gender"):
+            parsed = self.parse_file(f["f"])
+            if len(parsed) > 0:
+                s_name = f["s_name"]
+                for extension in (".predicted_gender", ".het_fraction", ".sry_coverage"):
+                    s_name = s_name.removesuffix(extension)
+                s_name = self.clean_s_name(s_name, f["root"])
+                records.append((s_name, parsed))
+                self.add_data_source(f, s_name)
+
+        if len(records) == 0:
+            raise UserWarning
+
+        # A sample's votes arrive spread over up to three files, so merge the
+        # records per sample by taking the first non-null value per column
+        s_names, rows = zip(*records)
+        del records
+        df = pd.DataFrame(list(rows), index=list(s_names))
+        df = df.groupby(level=0).first()
+        df = df[[not self.is_ignore_sample(s_name) for s_name in df.index]]
+
+        if len(df) == 0:
+            raise UserWarning
+
+        log.info(f"Found gender predictions for {len(df)} samples")
+
+        votes = df.reindex(columns=METHOD_KEYS)
+        count_m = (votes == "M").sum(axis=1)
+        count_f = (votes == "F").sum(axis=1)
+        # The majority count alone decides the call: with three methods, a
+        # 2-vote majority can never be overturned by the remaining vote
+        df["certainty"] = np.maximum(count_m, count_f) / 3.0
+        df["calc_gender"] = np.where(count_m > count_f, "M", np.where(count_f > count_m, "F", "Unknown"))
+
+        # Drop the NaN cells of methods that never ran for a sample
+        samplegender_data = {
+            s_name: {key: value for key, value in row.items() if value == value}
+            for s_name, row in df.to_dict("index").items()
+        }
+
+        self.write_data_file(samplegender_data, "multiqc_sample_gender")
+        self._create_table(samplegender_data)
+
+    def parse_file(self, f):
+        """
+        Parse a gender prediction file.
+        Keeps the prediction plus its supporting metrics (columns 2-6).
+        """
+        nl1 = f.find("\n")
+        if nl1 < 0:
+            return {}
+        nl2 = f.find("\n", nl1 + 1)
+
+        header_line = f[:nl1]
+        headers = header_line.split("\t", 6)[1:6]
+        values = (f[nl1 + 1 : nl2] if nl2 >= 0 else f[nl1 + 1 :]).split("\t", 6)[1:6]
+        if len(headers) == 0 or len(values) == 0:
+            return {}
+
+        # Rename the prediction column after the method that produced the file.
+        # Only one discriminating column is ever present, so one compiled-regex
+        # scan of the raw header line settles the dispatch.
+        match = HDR_RE.search(header_line)
+        if match:
+            headers[0] = PARAM_MAP[match.group(0)]
+
+        values[0] = SEX_MAP.get(values[0].lower(), values[0])
+
+        parsed_data = dict()
+        for key, value in zip(headers, values):
+            try:
+                val_float = float(value)
+                # NaN is the only float that does not equal itself
+                parsed_data[key] = "N/A" if val_float != val_float else val_float
+            except ValueError:
+                parsed_data[key] = value
+
+        return parsed_data
+
+    def _create_table(self, samplegender_data):
+        """Create the gender consensus table section"""
+
+        self.add_section(
+            name="Gender consensus",
+            anchor="sample_gender-consensus",
+            description="Consensus gender determination over all available prediction methods.",
+            plot=table.plot(samplegender_data, TABLE_HEADERS, TABLE_CONFIG),
+        )
@@ -0,0 +1,139 @@
+""" MultiQC submodule to parse output from the targeted MSH2 c.942+3 variant counting pipeline """
+
+import logging
+
+import numpy as np
+from multiqc.modules.base_module import BaseMultiqcModule
+from multiqc.plots import table
+
+# Initialize the logger
+log = logging.getLogger("multiqc")
+
+# The wildtype count column and the four targeted variant count columns
+WT_KEY = "MSH2_c.942+3_wt"
+VARIANT_KEYS = ("MSH2_c.942+3A>T", "MSH2_c.942+2T>A", "MSH2_c.942+2T>C", "MSH2_c.942+2T>G")
+
+# Display format of a variant cell, prebound to skip per-call attribute lookup
+FREQ_FMT = "{}% ({})".format
+
+# Conditional formatting shared by all four variant columns: any cell that
+# carries a frequency (and thus a space) is flagged for Sanger confirmation
+SANGER_RULES = {"sanger": [{"s_contains": " "}]}
+SANGER_COLOURS = [{"sanger": "#EE4B2B"}]
+
+# Table layout, shared across module instantiations
+TABLE_HEADERS = {
+    "MSH2_c.942+3_wt": {
+        "title": "WT",
+        "description": "Number of reads supporting the wildtype allele",
+        "format": "{:,.0f}",
+        "scale": False,
+    },
+    "MSH2_c.942+3A>T": {
+        "title": "c.942+3A>T",
+        "description": "Allele frequency (supporting reads) of MSH2 c.942+3A>T",
+        "scale": False,
+        "cond_formatting_rules": SANGER_RULES,
+        "cond_formatting_colours": SANGER_COLOURS,
+    },
+    "MSH2_c.942+2T>A": {
+        "title": "c.942+2T>A",
+        "description": "Allele frequency (supporting reads) of MSH2 c.942+2T>A",
+        "scale": False,
+        "cond_formatting_rules": SANGER_RULES,
+        "cond_formatting_colours": SANGER_COLOURS,
+    },
+    "MSH2_c.942+2T>C": {
+        "title": "c.942+2T>C",
+        "description": "Allele frequency (supporting reads) of MSH2 c.942+2T>C",
+        "scale": False,
+        "cond_formatting_rules": SANGER_RULES,
+        "cond_formatting_colours": SANGER_COLOURS,
+    },
+    "MSH2_c.942+2T>G": {
+        "title": "c.942+2T>G",
+        "description": "Allele frequency (supporting reads) of MSH2 c.942+2T>G",
+        "scale": False,
+        "cond_formatting_rules": SANGER_RULES,
+        "cond_formatting_colours": SANGER_COLOURS,
+    },
+}
+
+TABLE_CONFIG = {
+    "id": "targeted_MSH2_table",
+    "namespace": "targeted_MSH2",
+    "table_title": "MSH2: targeted variant counts",
+    "save_file": True,
+    "col1_header": "Sample",
+    "no_beeswarm": True,
+}
+
+
+class MultiqcModule(BaseMultiqcModule):
+    def __init__(self):
+
+        super(MultiqcModule, self).__init__(
+            name="MSH2",
+            anchor="targeted_MSH2",
+            info=" - Allele frequencies of the targeted MSH2 c.942+3 variants",
+        )
+
+        MSH2_varcount_data = dict()
+        for f in self.find_log_files("targeted_MSH2"):
+            parsed = self.parse_file(f["f"])
+            if len(parsed) > 0:
+                s_name = self.clean_s_name(f["s_name"], f["root"])
+                MSH2_varcount_data.setdefault(s_name, {}).update(parsed)
+                self.add_data_source(f, s_name)
+
+        MSH2_varcount_data = self.ignore_samples(MSH2_varcount_data)
+
+        if len(MSH2_varcount_data) == 0:
+            raise UserWarning
+
+        log.info(f"Found {len(MSH2_varcount_data)} MSH2 variant count reports")
+
+        self.write_data_file(MSH2_varcount_data, "multiqc_targeted_MSH2")
+
+        self.add_section(
+            name="MSH2 variant counts",
+            anchor="targeted_MSH2-varcounts",
+            description="Allele frequencies of the MSH2 c.942+3 variants, based on targeted read counts.",
+            plot=table.plot(MSH2_varcount_data, TABLE_HEADERS, TABLE_CONFIG),
+        )
+
+    def parse_file(self, f):
+        """
+        Parse a variant count file.
+        Only the header line (line 3) and the value line (line 4) are used, so scan for the
+        first four newlines and slice instead of materializing every line of the file.
+        """
+        if f.count("\n") < 3:
+            log.warning("Truncated MSH2 variant count file, skipping")
+            return {}
+
+        idx1 = f.find("\n")
+        idx2 = f.find("\n", idx1 + 1)
+        idx3 = f.find("\n", idx2 + 1)
+        idx4 = f.find("\n", idx3 + 1)
+
+        header_line = f[idx2 + 1 : idx3]
+        value_line = f[idx3 + 1 : idx4] if idx4 >= 0 else f[idx3 + 1 :]
+
+        parsed_data = dict(zip(header_line.split("\t"), value_line.split("\t")))
+        if WT_KEY not in parsed_data or any(key not in parsed_data for key in VARIANT_KEYS):
+            log.warning("Missing variant count columns in MSH2 variant count file, skipping")
+            return {}
+
+        wt = int(parsed_data[WT_KEY])
+        counts = np.fromiter((int(parsed_data[key]) for key in VARIANT_KEYS), dtype=np.int64, count=len(VARIANT_KEYS))
+        # A failed/empty sample can have wt == count == 0; mask those cells so
+        # no NaN frequency ends up in the report (and gets sanger-flagged)
+        denominators = wt + counts
+        valid = denominators > 0
+        freqs = np.round(np.divide(counts * 100.0, denominators, out=np.zeros(len(counts)), where=valid), 2)
+        for variant, freq, count, ok in zip(VARIANT_KEYS, freqs, counts, valid):
+            if ok:
+                parsed_data[variant] = FREQ_FMT(freq, count)
+
+        return parsed_data
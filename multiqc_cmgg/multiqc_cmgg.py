@@ -27,6 +27,8 @@ def update_config() -> None:
         [
             {"sampletracking": {"module_tag": ["DNA", "RNA"]}},
             {"demultiplex": {"module_tag": ["DNA", "RNA", "Demultiplex"]}},
+            {"targeted_MSH2": {"module_tag": ["DNA"]}},
+            {"sample_gender": {"module_tag": ["DNA"]}},
         ]
     )
 
@@ -63,6 +65,25 @@ def update_search_patterns() -> None:
             config.sp, {"picard/crosscheckfingerprints": {"fn": "nonexistent", "shared": False}},
         )
 
+    ## Targeted MSH2
+    if "targeted_MSH2" not in config.sp:
+        config.update_dict(
+            config.sp, {"targeted_MSH2": {"contents": "MSH2_c.942+3_wt", "shared": False}},
+        )
+
+    ## Sample gender
+    if "sample_gender" not in config.sp:
+        config.update_dict(
+            config.sp,
+            {
+                "sample_gender": [
+                    {"contents": "reads_chry", "shared": False},
+                    {"contents": "het_fraction", "shared": False},
+                    {"contents": "coverage_sry", "shared": False},
+                ]
+            },
+        )
+
 
 def update_fn_cleanup() -> None:
     """
@@ -19,12 +19,15 @@ setup(
     license="MIT",
     packages=find_packages(),
     include_package_data=True,
+    python_requires=">=3.9",
     install_requires=["multiqc>=1.10", "pandas"],
     entry_points={
         "multiqc.hooks.v1": ["config_loaded = multiqc_cmgg.multiqc_cmgg:update_config",],
         "multiqc.modules.v1": [
             "sampletracking = multiqc_cmgg.modules.sampletracking.sampletracking:MultiqcModule",
             "picard_demultiplex = multiqc_cmgg.modules.picard_demultiplex.demultiplex:MultiqcModule",
+            "targeted_MSH2 = multiqc_cmgg.modules.targeted_MSH2.targeted_MSH2:MultiqcModule",
+            "sample_gender = multiqc_cmgg.modules.sample_gender.sample_gender:MultiqcModule",
         ],
         "multiqc.templates.v1": ["cmgg = multiqc_cmgg.templates.cmgg",],
     },